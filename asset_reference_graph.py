@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Build a reference graph of the CBT platform's static assets.
+
+Starting from the HTML entry points (and math_diagram_map.json) the script
+follows every reference the browser would load:
+
+  * HTML  -> src/href attributes and path literals in inline scripts
+  * JS    -> path literals, including template literals such as
+             `src/data/subjects/${subject}_questions_${year}.json`
+  * CSS   -> url(...) and @import
+  * JSON  -> imagePath, questionImagePath and answerOptionsImagePath in the
+             subject question files, plus figures[].file for the subjects
+             whose scripts load it (biology, chemistry, economics)
+
+It then reports orphaned assets (files nothing reaches, e.g. backups and
+unused images) and dangling references (paths that point at missing files),
+and can copy only the reachable files into a pruned deploy tree.
+
+Usage:
+    python asset_reference_graph.py                 # print the report
+    python asset_reference_graph.py --json          # machine-readable report
+    python asset_reference_graph.py --prune dist/   # write a pruned deploy tree
+    python asset_reference_graph.py --check         # verify the resolution rules
+"""
+
+import argparse
+import json
+import re
+import shutil
+import sys
+import tempfile
+from collections import defaultdict, deque
+from pathlib import Path
+
+# Pages served to candidates. test_*.html are development pages and are not deployed.
+ENTRY_POINTS = [
+    "index.html",
+    "biology.html",
+    "chemistry.html",
+    "economics.html",
+    "english.html",
+    "mathematics.html",
+    "physics.html",
+]
+
+# Subjects offered by the entry pages; ${subject} placeholders expand only to these.
+SUBJECTS = [Path(name).stem for name in ENTRY_POINTS if name != "index.html"]
+
+# Values a ${...} placeholder may take, chosen by the placeholder's expression.
+# Years come from the scripts' `years` arrays ('jamb_2010') or as bare digits ('2010').
+YEAR_PATTERN = r"(?:jamb_)?\d{4}"
+SUBJECT_PATTERN = "(?:%s)" % "|".join(SUBJECTS)
+# Anything else stays within one underscore-delimited part of a file name.
+DEFAULT_PLACEHOLDER_PATTERN = r"[^/_]*"
+
+# Data files loaded by the diagram API rather than by a page.
+DATA_ROOTS = ["math_diagram_map.json"]
+
+# Directories whose files are candidates for deployment (checked for orphans).
+ASSET_DIRS = ["src"]
+
+ASSET_EXTENSIONS = (
+    "html", "js", "css", "json", "png", "jpg", "jpeg", "gif", "svg", "webp",
+    "ico", "woff", "woff2", "ttf", "txt",
+)
+
+# Subjects whose scripts load figures[].file. physics-script.js ignores it and
+# uses imagePath or its own physics_images/${year}_Q${n}.png template instead.
+FIGURE_FILE_SUBJECTS = ("biology", "chemistry", "economics")
+
+# Of those, the scripts that map "images/..." to src/data/subjects/images/...
+# (biology-script.js, economics-script.js). Any other figure file, including
+# every chemistry figure, is loaded unchanged relative to the site root.
+SUBJECT_RELATIVE_FIGURE_SUBJECTS = ("biology", "economics")
+
+# Data files no page can request; --check fails if any of them is reachable.
+UNSHIPPED_DATA_RE = re.compile(
+    r"^src/data/subjects/(?:english_questions_jamb_2010_organized"
+    r"|government_questions.*|financial_account_questions.*|new_questions.*)\.json$"
+)
+
+# Keys in the subject JSON files that hold a path relative to the site root.
+IMAGE_PATH_KEYS = ("imagePath", "questionImagePath", "answerOptionsImagePath")
+
+_EXT = "|".join(ASSET_EXTENSIONS)
+ATTR_RE = re.compile(r"""\b(?:src|href)\s*=\s*["']([^"'#?]+)""", re.IGNORECASE)
+LITERAL_RE = re.compile(r"""(["'`])((?:(?!\1)[^\n\\])*?\.(?:%s))\1""" % _EXT, re.IGNORECASE)
+CSS_URL_RE = re.compile(r"""url\(\s*["']?([^"')?#]+)""", re.IGNORECASE)
+CSS_IMPORT_RE = re.compile(r"""@import\s+["']([^"']+)["']""", re.IGNORECASE)
+PLACEHOLDER_RE = re.compile(r"\$\{[^}]*\}")
+# Comments often quote example paths; "//" after a colon is a URL, not a comment.
+JS_COMMENT_RE = re.compile(r"/\*.*?\*/|(?<![:\\])//[^\n]*", re.DOTALL)
+
+
+def is_external(ref):
+    """Return True for references that are not files in this tree."""
+    return bool(re.match(r"^(?:[a-z]+:|//|/api/|/workspace/)", ref, re.IGNORECASE))
+
+
+def placeholder_pattern(placeholder):
+    """Regex for the values a single ${...} placeholder can take."""
+    expression = placeholder.lower()
+    if "year" in expression:
+        return YEAR_PATTERN
+    if "subject" in expression:
+        return SUBJECT_PATTERN
+    return DEFAULT_PLACEHOLDER_PATTERN
+
+
+def template_to_regex(ref):
+    """
+    Turn a JS template literal into a regex over root-relative paths.
+
+    Placeholders naming a subject or year match only the subjects and years
+    the pages offer; any other placeholder matches within a single
+    underscore-delimited part of the file name. Templates
+    whose file name is nothing but a placeholder (e.g. `${figure.file}` or
+    `images/${id}.png`) would match every file in the directory, so they are
+    returned as None and reported as unresolved instead of expanded.
+    """
+    basename = ref.rsplit("/", 1)[-1]
+    stem = basename.rsplit(".", 1)[0]
+    if not PLACEHOLDER_RE.sub("", stem):
+        return None
+    pattern, pos = "", 0
+    for match in PLACEHOLDER_RE.finditer(ref):
+        pattern += re.escape(ref[pos:match.start()]) + placeholder_pattern(match.group())
+        pos = match.end()
+    return re.compile(pattern + re.escape(ref[pos:]) + "$")
+
+
+class AssetGraph:
+    """Reference graph of the files reachable from the site's entry points."""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.edges = defaultdict(set)        # source -> referenced files
+        self.dangling = defaultdict(set)     # source -> missing paths
+        self.unresolved = defaultdict(set)   # source -> dynamic refs that were not expanded
+        self.unparseable = {}                # JSON file -> error message
+        self.reachable = set()
+        self._all_files = None
+
+    # ------------------------------------------------------------------ paths
+
+    def rel(self, path):
+        return path.relative_to(self.root).as_posix()
+
+    def all_files(self):
+        """All candidate deploy files: entry points, data roots and ASSET_DIRS."""
+        if self._all_files is None:
+            files = set()
+            for name in ENTRY_POINTS + DATA_ROOTS:
+                if (self.root / name).is_file():
+                    files.add(name)
+            for name in ASSET_DIRS:
+                for path in (self.root / name).rglob("*"):
+                    if path.is_file() and not any(p.startswith(".") or p == "__pycache__"
+                                                  for p in path.relative_to(self.root).parts):
+                        files.add(self.rel(path))
+            self._all_files = sorted(files)
+        return self._all_files
+
+    def resolve(self, ref, base_dir):
+        """Resolve ref against base_dir (a root-relative directory) to a root-relative path."""
+        ref = ref.strip().replace("\\", "/")
+        if ref.startswith("/"):
+            candidate = self.root / ref.lstrip("/")
+        else:
+            candidate = self.root / base_dir / ref
+        try:
+            return self.rel(candidate.resolve())
+        except ValueError:
+            return None  # points outside the tree
+
+    def add_ref(self, source, ref, base_dir=""):
+        """Record an edge from source to ref, or a dangling reference if it is missing."""
+        if not ref or is_external(ref):
+            return
+        if "${" in ref:
+            self.add_template(source, ref)
+            return
+        target = self.resolve(ref, base_dir)
+        if target is None:
+            return
+        if (self.root / target).is_file():
+            self.edges[source].add(target)
+        else:
+            self.dangling[source].add(target)
+
+    def add_template(self, source, ref):
+        """Expand a JS template literal against the files that exist."""
+        pattern = template_to_regex(ref[2:] if ref.startswith("./") else ref)
+        if pattern is None:
+            self.unresolved[source].add(ref)
+            return
+        for name in self.all_files():
+            if pattern.match(name):
+                self.edges[source].add(name)
+
+    # --------------------------------------------------------------- parsers
+
+    def scan_html(self, source, text):
+        base_dir = Path(source).parent.as_posix()
+        for ref in ATTR_RE.findall(text):
+            self.add_ref(source, ref, base_dir)
+        # Inline scripts navigate with window.location.href = 'page.html' etc.
+        self.scan_js(source, text)
+
+    def scan_js(self, source, text):
+        base_dir = Path(source).parent.as_posix()
+        for _quote, ref in LITERAL_RE.findall(JS_COMMENT_RE.sub("", text)):
+            if ref.startswith("./") or ref.startswith("../"):
+                # ES module imports resolve against the importing file.
+                self.add_ref(source, ref, base_dir)
+            else:
+                # fetch() and <img src> resolve against the page, i.e. the site root.
+                self.add_ref(source, ref)
+
+    def scan_css(self, source, text):
+        base_dir = Path(source).parent.as_posix()
+        for ref in CSS_URL_RE.findall(text) + CSS_IMPORT_RE.findall(text):
+            if not ref.startswith("data:"):
+                self.add_ref(source, ref, base_dir)
+
+    def scan_json(self, source, text):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.unparseable[source] = str(e)
+            return
+        if Path(source).name in DATA_ROOTS:
+            # The diagram map holds inline SVG/HTML keyed by question id.
+            for value in data.values() if isinstance(data, dict) else []:
+                if isinstance(value, str):
+                    self.scan_html(source, value)
+            return
+        self._walk_json(source, data)
+
+    def figure_path(self, source, file):
+        """
+        Root-relative path the subject script loads for figures[].file, or None
+        if that subject's script never reads figures[].file.
+        """
+        subject = Path(source).name.split("_", 1)[0]
+        if subject not in FIGURE_FILE_SUBJECTS:
+            return None
+        if subject in SUBJECT_RELATIVE_FIGURE_SUBJECTS and file.startswith("images/"):
+            return f"{Path(source).parent.as_posix()}/{file}"
+        return file
+
+    def _walk_json(self, source, node):
+        if isinstance(node, dict):
+            for figure in node.get("figures") or []:
+                if isinstance(figure, dict) and figure.get("file"):
+                    path = self.figure_path(source, figure["file"])
+                    if path is not None:
+                        self.add_ref(source, path)
+            for key in IMAGE_PATH_KEYS:
+                if isinstance(node.get(key), str) and node[key]:
+                    self.add_ref(source, node[key])
+            for key, value in node.items():
+                if key != "figures":
+                    self._walk_json(source, value)
+        elif isinstance(node, list):
+            for item in node:
+                self._walk_json(source, item)
+
+    # ----------------------------------------------------------------- build
+
+    def build(self):
+        """Walk the graph breadth-first from the entry points."""
+        scanners = {
+            ".html": self.scan_html,
+            ".js": self.scan_js,
+            ".css": self.scan_css,
+            ".json": self.scan_json,
+        }
+        queue = deque(name for name in ENTRY_POINTS + DATA_ROOTS if (self.root / name).is_file())
+        self.reachable = set(queue)
+        while queue:
+            source = queue.popleft()
+            scanner = scanners.get(Path(source).suffix.lower())
+            if scanner is not None:
+                text = (self.root / source).read_text(encoding="utf-8", errors="replace")
+                scanner(source, text)
+            for target in sorted(self.edges[source]):
+                if target not in self.reachable:
+                    self.reachable.add(target)
+                    queue.append(target)
+        return self
+
+    # ---------------------------------------------------------------- report
+
+    def orphans(self):
+        return [name for name in self.all_files() if name not in self.reachable]
+
+    def suggestion(self, missing):
+        """Existing files with the same name as a missing reference."""
+        name = Path(missing).name
+        return [f for f in self.all_files() if Path(f).name == name]
+
+    def size(self, names):
+        return sum((self.root / name).stat().st_size for name in names)
+
+    def report(self):
+        orphans = self.orphans()
+        reachable = sorted(self.reachable)
+        return {
+            "reachable": reachable,
+            "reachable_bytes": self.size(reachable),
+            "orphaned": orphans,
+            "orphaned_bytes": self.size(orphans),
+            "dangling": {
+                source: [
+                    {"path": path, "candidates": self.suggestion(path)}
+                    for path in sorted(paths)
+                ]
+                for source, paths in sorted(self.dangling.items())
+                if source in self.reachable
+            },
+            "unresolved": {
+                source: sorted(refs)
+                for source, refs in sorted(self.unresolved.items())
+                if source in self.reachable
+            },
+            "unparseable": dict(sorted(self.unparseable.items())),
+        }
+
+    def prune(self, output_dir):
+        """Copy the reachable files into output_dir, preserving their paths."""
+        output_dir = Path(output_dir).resolve()
+        if output_dir == self.root or (self.root in output_dir.parents
+                                       and output_dir.relative_to(self.root).parts[0] in ASSET_DIRS):
+            raise ValueError(f"Refusing to prune into {output_dir}: it overlaps the source tree")
+        if output_dir.exists() and not output_dir.is_dir():
+            raise ValueError(f"Refusing to prune into {output_dir}: it is not a directory")
+        if output_dir.exists() and any(output_dir.iterdir()):
+            # Stale files from an earlier deploy would otherwise survive the prune.
+            raise ValueError(f"Refusing to prune into {output_dir}: directory is not empty")
+        for name in sorted(self.reachable):
+            target = output_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.root / name, target)
+        return output_dir
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024 or unit == "MB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+def print_report(report):
+    print(f"Reachable files: {len(report['reachable'])} ({format_bytes(report['reachable_bytes'])})")
+    print(f"Orphaned files:  {len(report['orphaned'])} ({format_bytes(report['orphaned_bytes'])})")
+    for name in report["orphaned"]:
+        print(f"  {name}")
+
+    dangling_count = sum(len(paths) for paths in report["dangling"].values())
+    print(f"\nDangling references: {dangling_count}")
+    for source, entries in report["dangling"].items():
+        print(f"  {source}")
+        for entry in entries:
+            hint = f"  (exists as {', '.join(entry['candidates'])})" if entry["candidates"] else ""
+            print(f"    -> {entry['path']}{hint}")
+
+    if report["unresolved"]:
+        print("\nDynamic references not expanded (verify manually):")
+        for source, refs in report["unresolved"].items():
+            for ref in refs:
+                print(f"  {source}: {ref}")
+
+    if report["unparseable"]:
+        print(f"\nUnparseable JSON files: {len(report['unparseable'])}")
+        for source, error in report["unparseable"].items():
+            print(f"  {source}: {error}")
+
+
+def self_check(graph):
+    """
+    Check the resolution rules against the tree and return a list of failures.
+
+    Guards the heuristics in placeholder_pattern() and figure_path(): a change
+    to them must not ship data files no page can load, nor move figure paths.
+    """
+    failures = []
+
+    expected_figures = [
+        ("src/data/subjects/biology_questions_jamb_2010.json", "images/a.png",
+         "src/data/subjects/images/a.png"),
+        ("src/data/subjects/economics_questions_jamb_1983.json", "images/a.png",
+         "src/data/subjects/images/a.png"),
+        ("src/data/subjects/chemistry_questions_jamb_2010.json", "images/a.png", "images/a.png"),
+        ("src/data/subjects/chemistry_questions_jamb_2011.json", "upload_1.png", "upload_1.png"),
+        ("src/data/subjects/physics_questions_jamb_2010.json", "2010_Q3.png", None),
+    ]
+    for source, file, expected in expected_figures:
+        actual = graph.figure_path(source, file)
+        if actual != expected:
+            failures.append(f"figure_path({source!r}, {file!r}) = {actual!r}, expected {expected!r}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = graph.prune(Path(tmp) / "dist")
+        shipped = {path.relative_to(output_dir).as_posix()
+                   for path in output_dir.rglob("*") if path.is_file()}
+    for name in sorted(shipped):
+        if UNSHIPPED_DATA_RE.match(name):
+            failures.append(f"{name} is in the pruned tree but no page loads it")
+
+    for source in graph.all_files():
+        if re.match(r"^src/data/subjects/(?:biology|economics)_questions_.*\.json$", source) \
+                and source not in graph.unparseable:
+            data = json.loads((graph.root / source).read_text(encoding="utf-8"))
+            for figure in data.get("figures") or [] if isinstance(data, dict) else []:
+                file = figure.get("file", "") if isinstance(figure, dict) else ""
+                path = f"src/data/subjects/{file}"
+                if file.startswith("images/") and (graph.root / path).is_file() \
+                        and path not in shipped:
+                    failures.append(f"{path} (figure in {source}) is missing from the pruned tree")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", default=Path(__file__).resolve().parent,
+                        help="Repository root (defaults to this script's directory)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--prune", metavar="DIR",
+                        help="Copy only the reachable files into DIR for deployment")
+    parser.add_argument("--check", action="store_true",
+                        help="Verify figure resolution and data-file pruning, then exit")
+    args = parser.parse_args()
+
+    graph = AssetGraph(args.root).build()
+
+    if args.check:
+        failures = self_check(graph)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+        sys.exit(1 if failures else 0)
+
+    report = graph.report()
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+
+    if args.prune:
+        try:
+            output_dir = graph.prune(args.prune)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nWrote {len(report['reachable'])} files to {output_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()